@@ -2,7 +2,7 @@ import pytest
 import pandas as pd
 import numpy as np
 from pandas.testing import assert_series_equal
-from tradepy.core.adjust_factors import AdjustFactors, _assign_factor_value_to_day
+from tradepy.core.adjust_factors import AdjustFactors
 
 
 @pytest.fixture
@@ -62,13 +62,17 @@ def test_adjust_factors_history_prices(
     assert_series_equal(adj_df["close"], orig_df["close"] * hfq_factor)
 
 
-def test_assign_factor_value_to_day():
-    timestamps = [1, 2, 3]
-    fac_ts = [1, 2, 3, 4, 5]
-    fac_vals = [2.0, 2.2, 2.5, 1.5, 1.7]
+def test_adjust_factors_history_prices_of_multiple_days(
+    adjust_factors: AdjustFactors,
+    sample_stock_day_k: pd.DataFrame,
+):
+    orig_df = sample_stock_day_k.loc["000333"]
+    adj_df = adjust_factors.backward_adjust_history_prices("000333", orig_df.copy())
 
-    factors = _assign_factor_value_to_day(fac_ts, fac_vals, timestamps)
-    assert factors == [2.0, 2.2, 2.5]  # Expected adjusted factors for timestamps
+    hfq_factors = pd.Series([2.0, 2.2, 2.2], index=orig_df.index)
+    assert_series_equal(
+        adj_df["close"], orig_df["close"] * hfq_factors, check_names=False
+    )
 
 
 @pytest.mark.parametrize(
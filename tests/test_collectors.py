@@ -17,6 +17,7 @@ from tradepy.collectors.market_index import (
 )
 from tradepy.collectors.stock_listing import StockListingDepot, StocksListingCollector
 from tradepy.collectors.stock_day_bars import StockDayBarsCollector
+from tradepy.depot.stocks import StocksDailyBarsDepot
 from tradepy.conversion import broad_index_code_name_mapping
 from .helpers import skip_if_in_ci
 
@@ -103,6 +104,52 @@ def test_collect_new_stocks_day_k(
         )
 
 
+def test_compute_mkt_cap_percentile_ranks():
+    df = pd.DataFrame(
+        {
+            "timestamp": ["2023-09-18"] * 4 + ["2023-09-19"] * 3,
+            "mkt_cap": [40.0, 10.0, 10.0, 30.0, 20.0, None, 10.0],
+            # Stale ranks (e.g., of an older scale) are recomputed as well
+            "mkt_cap_rank": [0.5, 0.5, 0.5, 0.5, 0.99, 0.99, 0.99],
+        }
+    ).set_index("timestamp")
+
+    df = StockDayBarsCollector._compute_mkt_cap_percentile_ranks(df)
+
+    # Ties share the average rank
+    assert df["mkt_cap_rank"].tolist()[:4] == [1.0, 0.375, 0.375, 0.75]
+    # A missing market cap ranks the lowest, without counting in the others' ranks
+    assert df["mkt_cap_rank"].tolist()[4:] == [1.0, 0.0, 0.5]
+
+
+def test_save_partitioned_bars():
+    df = pd.DataFrame(
+        {
+            "timestamp": ["2023-09-19", "2023-09-18", "2023-09-20", "2023-09-18"],
+            "code": ["000002", "000001", "000001", "000002"],
+            "close": [2.0, 1.0, 3.0, 4.0],
+        }
+    )
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        with mock.patch("tradepy.config.common.database_dir", Path(tempdir)):
+            depot = StocksDailyBarsDepot()
+            paths = depot.save_partitioned(df, by="code")
+
+            # One csv per code, without the code column
+            assert sorted(p.name for p in paths) == ["000001.csv", "000002.csv"]
+            assert sorted(p.name for p in depot.folder.iterdir()) == [
+                "000001.csv",
+                "000002.csv",
+            ]
+
+            for code in ["000001", "000002"]:
+                saved_df = pd.read_csv(depot.folder / f"{code}.csv")
+                expected_df = df[df["code"] == code].drop("code", axis=1)
+                # Rows of each code keep their original order
+                assert_frame_equal(saved_df, expected_df.reset_index(drop=True))
+
+
 @skip_if_in_ci()
 def test_collect_stocks_with_name_changes():
     stocks_had_name_changes = [
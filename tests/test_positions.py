@@ -1,6 +1,7 @@
 import pytest
+import multiprocessing as mp
 from pytest import approx
-from tradepy.core.order import SellRemark
+from tradepy.core.order import Order, SellRemark
 from tradepy.core.position import Position
 
 
@@ -80,3 +81,22 @@ def test_to_sell_order(position: Position, closed_position: Position):
     assert sell_remark["price"] == closing_price
     assert sell_remark["vol"] == order.vol
     assert sell_remark["pct_chg"] == approx(5)
+
+
+def _make_order_id_in_child(queue):
+    queue.put(Order.make_id("000333"))
+
+
+def test_forked_processes_make_distinct_order_ids():
+    ctx = mp.get_context("fork")
+    queue = ctx.Queue()
+    children = [
+        ctx.Process(target=_make_order_id_in_child, args=(queue,)) for _ in range(2)
+    ]
+    for child in children:
+        child.start()
+    for child in children:
+        child.join()
+
+    ids = [queue.get() for _ in children] + [Order.make_id("000333")]
+    assert len(set(ids)) == len(ids)
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 import talib
@@ -6,9 +7,11 @@ from unittest import mock
 
 from tradepy.strategy.base import BacktestStrategy, LiveStrategy, BuyOption
 from tradepy.strategy.factors import FactorsMixin
-from tradepy.decorators import tag
+from tradepy.decorators import tag, jit_predicate
 from tradepy.core.conf import BacktestConf, StrategyConf, SlippageConf
 from tradepy.core.position import Position
+from tradepy.core.holdings import Holdings
+from tradepy.backtest.backtester import Backtester
 
 
 class SampleBacktestStrategy(BacktestStrategy, FactorsMixin):
@@ -34,6 +37,30 @@ class SampleBacktestStrategy(BacktestStrategy, FactorsMixin):
         return bars_df.query('market != "科创板"').copy()
 
 
+class SampleVectorizedBacktestStrategy(SampleBacktestStrategy):
+    def should_buy_vec(self, sma5, boll_lower, close, vol, vol_ref1):
+        return (close <= boll_lower) | ((close >= sma5) & (vol > vol_ref1))
+
+    def should_sell_vec(self, close, boll_upper):
+        return close >= boll_upper
+
+
+class SampleJitBacktestStrategy(SampleBacktestStrategy):
+    @jit_predicate
+    def should_buy(self, sma5, boll_lower, close, vol, vol_ref1) -> BuyOption | None:
+        if close <= boll_lower:
+            return close, 1
+
+        if close >= sma5 and vol > vol_ref1:
+            return close, 1
+
+        return None
+
+    @jit_predicate
+    def should_sell(self, close, boll_upper) -> bool:
+        return close >= boll_upper
+
+
 class SampleLiveStrategy(LiveStrategy):
     ...
 
@@ -199,6 +226,57 @@ def test_live_strategy_take_profit(
     )
 
 
+@pytest.mark.parametrize(
+    "pct_chg",
+    [-10, -3.01, -3, -2.995, -2.99, 0, 3.99, 3.995, 4, 4.01, 10],
+)
+@pytest.mark.parametrize("open_is_nan", [False, True])
+def test_backtest_strategy_vectorized_sell_candidates(
+    sample_strategy: SampleBacktestStrategy,
+    sample_position: Position,
+    pct_chg: float,
+    open_is_nan: bool,
+):
+    price = sample_position.price_at_pct_change(pct_chg)
+    bar: Any = {"open": price, "close": price, "high": price, "low": price}
+    if open_is_nan:
+        # The low / high alone can still trigger the stop loss / take profit
+        bar["open"] = np.nan
+    bars = {field: np.array([value], dtype=np.float32) for field, value in bar.items()}
+    prices = np.array([sample_position.price], dtype=np.float32)
+
+    # Every position that triggers the stop loss / take profit must be a candidate
+    if sample_strategy.should_stop_loss(bar, sample_position):
+        assert sample_strategy.should_stop_loss_vec(bars, prices)[0]  # type: ignore
+
+    if sample_strategy.should_take_profit(bar, sample_position):
+        assert sample_strategy.should_take_profit_vec(bars, prices)[0]  # type: ignore
+
+
+def test_backtest_bars_carry_all_columns(
+    sample_strategy: SampleBacktestStrategy,
+    local_stocks_day_k_df: pd.DataFrame,
+):
+    seen_bars = []
+
+    class Strategy(SampleBacktestStrategy):
+        def should_stop_loss(self, bar, position):
+            seen_bars.append(bar)
+            return super().should_stop_loss(bar, position)
+
+    df = sample_strategy.compute_all_indicators_df(local_stocks_day_k_df.copy())
+    bt = Backtester(backtest_conf)
+    bt.trade(df, Strategy(strategy_conf))
+
+    # The bar is the whole row, with plain Python scalars
+    assert seen_bars
+    assert set(seen_bars[0]) == set(df.columns)
+    assert type(seen_bars[0]["close"]) is float
+
+    # The columns are released once trading is done
+    assert not bt._bar_columns
+
+
 def test_compute_indicators(
     sample_strategy: SampleBacktestStrategy,
     local_stocks_day_k_df: pd.DataFrame,
@@ -237,6 +315,58 @@ def test_remove_stocks_without_adjust_factors(
     assert "999999" not in df.index
 
 
+@pytest.mark.parametrize(
+    "vec_strategy_class",
+    [SampleVectorizedBacktestStrategy, SampleJitBacktestStrategy],
+)
+def test_vectorized_signals(
+    vec_strategy_class: type[SampleBacktestStrategy],
+    sample_strategy: SampleBacktestStrategy,
+    local_stocks_day_k_df: pd.DataFrame,
+):
+    vec_strategy = vec_strategy_class(strategy_conf)
+    df = sample_strategy.compute_all_indicators_df(local_stocks_day_k_df.copy())
+    bt = Backtester(backtest_conf)
+
+    # The vectorized path must really be taken (e.g., the jit predicates compile),
+    # rather than silently falling back to the scalar one
+    day_df = df[df["timestamp"] == df["timestamp"].iloc[0]]
+    for indicators, vec_method in [
+        (vec_strategy.buy_indicators, vec_strategy.should_buy_vec),
+        (vec_strategy.sell_indicators, vec_strategy.should_sell_vec),
+    ]:
+        mask = vec_method(*(day_df[col].to_numpy() for col in indicators))
+        assert isinstance(mask, np.ndarray)
+        assert mask.dtype == bool and len(mask) == len(day_df)
+
+    for _, day_df in df.groupby("timestamp"):
+        buys_df = bt.get_buy_options(day_df, sample_strategy)
+        vec_buys_df = bt.get_buy_options(day_df, vec_strategy)
+        assert set(buys_df.index) == set(vec_buys_df.index)
+
+        with mock.patch.object(
+            Holdings,
+            "position_codes",
+            new_callable=mock.PropertyMock,
+            return_value=set(day_df.index),
+        ):
+            close_codes = bt.get_close_signals(day_df, sample_strategy)
+            vec_close_codes = bt.get_close_signals(day_df, vec_strategy)
+            assert close_codes == vec_close_codes
+
+
+def test_jit_predicate_falls_back_if_not_compilable():
+    class Strategy(SampleBacktestStrategy):
+        @jit_predicate
+        def should_sell(self, close, boll_upper) -> bool:
+            return close >= boll_upper * self.take_profit
+
+    strategy = Strategy(strategy_conf)
+    close = np.array([1.0, 2.0])
+    assert strategy.should_sell_vec(close, close) is None
+    assert not strategy.should_sell(1.0, 1.0)
+
+
 def test_generate_valid_buy_orders(
     sample_strategy: SampleBacktestStrategy,
     sample_portfolio: pd.DataFrame,
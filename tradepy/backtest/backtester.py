@@ -2,6 +2,7 @@ import sys
 import random
 import pandas as pd
 import numpy as np
+from itertools import compress
 from typing import TYPE_CHECKING
 from tqdm import tqdm
 
@@ -14,6 +15,7 @@ from tradepy.depot.stocks import StockMinuteBarsDepot
 from tradepy.mixins import TradeMixin
 from tradepy.trade_book import TradeBook
 from tradepy.core.conf import BacktestConf, SlippageConf
+from tradepy.strategy.base import BarData
 
 if TYPE_CHECKING:
     from tradepy.strategy.base import StrategyBase
@@ -31,6 +33,34 @@ class Backtester(TradeMixin):
         self.use_minute_k = conf.use_minute_k
         self.sl_tf_order = conf.sl_tf_order
 
+        # Column name => values, aligned with the rows of the frame being traded.
+        # Only held during `trade`
+        self._bar_columns: dict[str, np.ndarray] = dict()
+
+    def _get_bar(self, row: int) -> BarData:
+        # `.item` gives back plain Python scalars, just like the row of the frame
+        return {  # type: ignore
+            field: values.item(row) for field, values in self._bar_columns.items()
+        }
+
+    def _get_sell_candidates(
+        self, strategy: "StrategyBase", rows: list[int], positions: list[Position]
+    ) -> tuple[np.ndarray | None, np.ndarray | None]:
+        if not rows:
+            return None, None
+
+        # Single precision is plenty for screening the candidates, so only cast the
+        # gathered rows of the positions held
+        bars = {
+            field: self._bar_columns[field][rows].astype(np.float32)
+            for field in ("open", "close", "high", "low")
+        }
+        prices = np.array([pos.price for pos in positions], dtype=np.float32)
+        return (
+            strategy.should_stop_loss_vec(bars, prices),
+            strategy.should_take_profit_vec(bars, prices),
+        )
+
     def _jit_sell_price(
         self, price: float, slip: SlippageConf, orig_open_price: float
     ) -> float:
@@ -81,12 +111,18 @@ class Backtester(TradeMixin):
             1 - 1e-4 * 3, 1 + 1e-4 * 3
         )  # 0.03% slip
 
+        columns = [bars_df[col] for col in strategy.buy_indicators]
+        mask = strategy.should_buy_vec(*(col.to_numpy() for col in columns))
+
+        # Zip the plain column lists rather than building an indicator sub-frame
+        rows = zip(bars_df.index, *(col.tolist() for col in columns))
+        if mask is not None:
+            rows = compress(rows, mask)
+
         # Looks ugly but it's fast...
         codes_and_prices = [
             (code, jitter_price(price_and_weight[0]), price_and_weight[1])
-            for code, *indicators in bars_df[strategy.buy_indicators].itertuples(
-                name=None
-            )
+            for code, *indicators in rows
             if (code not in holding_codes)
             and (not Blacklist.contains(code))
             and (price_and_weight := strategy.should_buy(*indicators))
@@ -114,9 +150,15 @@ class Backtester(TradeMixin):
         if not curr_positions:
             return []
 
+        columns = [df[col] for col in strategy.sell_indicators]
+        mask = strategy.should_sell_vec(*(col.to_numpy() for col in columns))
+        if mask is not None:
+            codes = df.index.to_numpy()
+            return codes[mask & np.isin(codes, list(curr_positions))].tolist()
+
         return [
             code
-            for code, *indicators in df[strategy.sell_indicators].itertuples(name=None)
+            for code, *indicators in zip(df.index, *(col.tolist() for col in columns))
             if (code in curr_positions) and strategy.should_sell(*indicators)
         ]
 
@@ -124,6 +166,7 @@ class Backtester(TradeMixin):
         self,
         date: str,
         bars_df: pd.DataFrame,
+        code_to_row: dict[str, int],
         trade_book: TradeBook,
         strategy: "StrategyBase",
     ):
@@ -132,14 +175,31 @@ class Backtester(TradeMixin):
         close_codes = self.get_close_signals(bars_df, strategy)
         sell_positions = []
 
-        for code, pos in self.account.holdings:
-            if code not in bars_df.index:
-                # Not a tradable day, so nothing to do
+        # Not a tradable day for the stocks absent from today's bars, so nothing to do
+        tradable = [
+            (code, pos, row)
+            for code, pos in self.account.holdings
+            if (row := code_to_row.get(code)) is not None
+        ]
+        stop_loss_mask, take_profit_mask = self._get_sell_candidates(
+            strategy, [row for _, _, row in tradable], [pos for _, pos, _ in tradable]
+        )
+
+        for idx, (code, pos, row) in enumerate(tradable):
+            might_stop_loss = stop_loss_mask is None or stop_loss_mask[idx]
+            might_take_profit = take_profit_mask is None or take_profit_mask[idx]
+            if not (might_stop_loss or might_take_profit or code in close_codes):
                 continue
 
-            bar = bars_df.loc[code].to_dict()  # type: ignore
-            stop_loss_price = self.should_stop_loss(strategy, bar, pos)
-            take_profit_price = self.should_take_profit(strategy, bar, pos)
+            bar = self._get_bar(row)
+            stop_loss_price = (
+                self.should_stop_loss(strategy, bar, pos) if might_stop_loss else None
+            )
+            take_profit_price = (
+                self.should_take_profit(strategy, bar, pos)
+                if might_take_profit
+                else None
+            )
 
             if stop_loss_price or take_profit_price:
                 should_stop_loss = False
@@ -316,40 +376,67 @@ class Backtester(TradeMixin):
         random.seed()
         if list(getattr(df.index, "names", [])) != ["timestamp", "code"]:
             LOG.info(">>> 重建索引 [timestamp, code]")
-            try:
+            if not {"timestamp", "code"}.issubset(df.columns):
                 df.reset_index(inplace=True)
-            except ValueError:
-                df.reset_index(inplace=True, drop=True)
+            # Set the new index straight from the columns, skipping a reset_index round trip
             df.set_index(["timestamp", "code"], inplace=True, drop=False)
+
+        if not df.index.is_monotonic_increasing:
             df.sort_index(inplace=True)
 
         LOG.info(">>> 交易中 ...")
         trade_book = TradeBook.backtest()
 
-        # Per day
-        month, month_minute_df = None, pd.DataFrame()
-        for date, bars_df in tqdm(df.groupby(level="timestamp"), file=sys.stdout):
-            assert isinstance(date, str)
-
-            # Opening
-            bars_df = bars_df.loc[date]  # to remove the timestamp index
-            price_lookup = lambda code: bars_df.loc[code, "close"]  # NOTE: slow
-            self.account.update_holdings(price_lookup)
+        # Pull the columns out of the frame once (views rather than copies for the
+        # numeric ones), so that the daily loop looks up bars by plain array indexing
+        # rather than `.loc` on the MultiIndex
+        self._bar_columns = {field: df[field].to_numpy() for field in df.columns}
+        close_arr = self._bar_columns["close"]
+        codes = df.index.get_level_values("code").to_numpy()
 
-            # Trading
-            if self.use_minute_k:
-                if month != date[:7]:
-                    month = date[:7]
-                    month_minute_df = StockMinuteBarsDepot.load(month)
+        # Row range [start, end) of each day
+        dates, day_starts = np.unique(
+            df.index.get_level_values("timestamp").to_numpy(), return_index=True
+        )
+        day_ends = np.append(day_starts[1:], len(df))
 
-                self._trade_using_minute_k(
-                    date, bars_df, month_minute_df.loc[(date,)], trade_book, strategy
-                )
-            else:
-                self._trade_using_day_k(date, bars_df, trade_book, strategy)
+        try:
+            # Per day
+            month, month_minute_df = None, pd.DataFrame()
+            for date, start, end in tqdm(
+                zip(dates, day_starts, day_ends), total=len(dates), file=sys.stdout
+            ):
+                assert isinstance(date, str)
+                code_to_row = dict(zip(codes[start:end], range(start, end)))
+
+                # Opening
+                bars_df = df.iloc[start:end].droplevel("timestamp")
+                price_lookup = lambda code: close_arr.item(code_to_row[code])
+                self.account.update_holdings(price_lookup)
+
+                # Trading
+                if self.use_minute_k:
+                    if month != date[:7]:
+                        month = date[:7]
+                        month_minute_df = StockMinuteBarsDepot.load(month)
+
+                    self._trade_using_minute_k(
+                        date,
+                        bars_df,
+                        month_minute_df.loc[(date,)],
+                        trade_book,
+                        strategy,
+                    )
+                else:
+                    self._trade_using_day_k(
+                        date, bars_df, code_to_row, trade_book, strategy
+                    )
 
-            # Logging
-            trade_book.log_closing_capitals(date, self.account)
+                # Logging
+                trade_book.log_closing_capitals(date, self.account)
+        finally:
+            # Don't hold on to the whole frame's columns after trading
+            self._bar_columns = dict()
 
         # That was quite a long story :D
         return trade_book
@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 import quantstats as qs
 from dataclasses import dataclass
+from functools import cached_property
 from tradepy.trade_book import TradeBook
 from tradepy.trade_cal import trade_cal
 
@@ -58,27 +59,37 @@ class BasicEvaluator(ResultEvaluator):
     def get_total_returns(self) -> float:
         return round(100 * self.capitals.iloc[-1] / self.capitals.iloc[0], 2)
 
+    @cached_property
+    def action_counts(self) -> dict[str, int]:
+        # Count all the actions in one pass, instead of comparing the column once per action
+        actions, counts = np.unique(
+            self.trades_df["action"].to_numpy(), return_counts=True
+        )
+        return dict(zip(actions.tolist(), counts.tolist()))
+
     @coerce_type(float)
     def get_win_rate(self) -> float:
-        wins = (self.trades_df.query('action != "开仓"')["pct_chg"] > 0).sum()
-        loss = (self.trades_df.query('action != "开仓"')["pct_chg"] <= 0).sum()
+        is_close = self.trades_df["action"].to_numpy() != "开仓"
+        pct_chgs = self.trades_df["pct_chg"].to_numpy()[is_close]
+        wins = (pct_chgs > 0).sum()
+        loss = (pct_chgs <= 0).sum()
         return round(100 * wins / (wins + loss), 2)
 
     @coerce_type(int)
     def get_number_of_trades(self) -> int:
-        return (self.trades_df["action"] == "开仓").sum()
+        return self.action_counts.get("开仓", 0)
 
     @coerce_type(int)
     def get_number_of_stop_loss(self) -> int:
-        return (self.trades_df["action"] == "止损").sum()
+        return self.action_counts.get("止损", 0)
 
     @coerce_type(int)
     def get_number_of_take_profit(self) -> int:
-        return (self.trades_df["action"] == "止盈").sum()
+        return self.action_counts.get("止盈", 0)
 
     @coerce_type(int)
     def get_number_of_close(self) -> int:
-        return (self.trades_df["action"] == "平仓").sum()
+        return self.action_counts.get("平仓", 0)
 
     @coerce_type(float)
     def get_avg_return(self) -> float:
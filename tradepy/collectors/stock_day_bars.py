@@ -1,6 +1,4 @@
-import numpy as np
 import pandas as pd
-from tqdm import tqdm
 from datetime import date
 
 import tradepy
@@ -71,20 +69,13 @@ class StockDayBarsCollector(DayBarsCollector):
 
         return res
 
-    def _compute_mkt_cap_percentile_ranks(self, df: pd.DataFrame):
-        for _, day_df in tqdm(df.groupby(level="timestamp")):
-            if ("mkt_cap_rank" in day_df) and (day_df["mkt_cap_rank"].notnull().all()):
-                yield day_df
-                continue
-
-            mkt_cap_lst = [row.mkt_cap for row in day_df.itertuples()]
-
-            mkt_cap_percentiles = np.percentile(mkt_cap_lst, q=range(100))
-            day_df["mkt_cap_rank"] = [
-                (mkt_cap_percentiles < v).sum() / len(mkt_cap_percentiles)
-                for v in mkt_cap_lst
-            ]
-            yield day_df
+    @staticmethod
+    def _compute_mkt_cap_percentile_ranks(df: pd.DataFrame) -> pd.DataFrame:
+        # Always recompute every day, so that the whole history shares the same scale.
+        # Missing market caps rank the lowest (0), and don't count in the others' ranks
+        ranks = df.groupby(level="timestamp")["mkt_cap"].rank(pct=True)
+        df["mkt_cap_rank"] = ranks.fillna(0)
+        return df
 
     def run(
         self, batch_size=50, iteration_pause=5, selected_stocks=None, write_file=True
@@ -111,14 +102,11 @@ class StockDayBarsCollector(DayBarsCollector):
 
         LOG.info("计算个股的每日市值分位")
         df = self.repo.load(index_by="timestamp", fields="all")
-        df = pd.concat(self._compute_mkt_cap_percentile_ranks(df))
+        df = self._compute_mkt_cap_percentile_ranks(df)
         df.reset_index(inplace=True, drop=True)
 
         if write_file:
             LOG.info("保存中")
-            for code, sub_df in df.groupby("code"):
-                sub_df.drop("code", axis=1, inplace=True)
-                assert isinstance(code, str)
-                self.repo.save(sub_df, filename=code + ".csv")
+            self.repo.save_partitioned(df, by="code")
 
         return df
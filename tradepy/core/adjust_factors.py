@@ -1,23 +1,8 @@
 import pandas as pd
 import numpy as np
-import numba as nb
 from functools import cached_property
 
 
-@nb.njit(cache=True)
-def _assign_factor_value_to_day(fac_ts, fac_vals, timestamps):
-    i = 0
-
-    factors = []
-    for ts in timestamps:
-        while True:
-            if fac_ts[i + 1] > ts:
-                break
-            i += 1
-        factors.append(fac_vals[i])
-    return factors
-
-
 class AdjustFactors:
     def __init__(self, factors_df: pd.DataFrame):
         adj_fac_cols = set(["code", "timestamp", "hfq_factor"])
@@ -30,6 +15,12 @@ class AdjustFactors:
         self.factors_df = factors_df.copy()
         self.factors_df.sort_values(["code", "timestamp"], inplace=True)
 
+        # code => (timestamps, factors), so looking up a stock's factors is a dict hit
+        self.factors_by_code: dict[str, tuple[np.ndarray, np.ndarray]] = {
+            code: (sub_df["timestamp"].to_numpy(), sub_df["hfq_factor"].to_numpy())
+            for code, sub_df in self.factors_df.groupby(level="code", sort=False)
+        }
+
     @cached_property
     def latest_factors(self) -> pd.DataFrame:
         return self.factors_df.groupby("code").tail(2).dropna()  # drop the end padding
@@ -42,24 +33,31 @@ class AdjustFactors:
         """
         bars_df: an individual stock's day bars
         """
-        factors_df = self.factors_df.loc[code]
+        fac_ts, fac_vals = self.factors_by_code[code]
+
+        # Find each day's adjust factor, i.e., the latest one as of that day
+        indices = np.searchsorted(fac_ts, bars_df["timestamp"].to_numpy(), side="right")
+        factor_vals = fac_vals[np.clip(indices - 1, 0, None)]
+
+        # Adjust prices accordingly, on the plain arrays rather than a Series per step
+        close = bars_df["close"].to_numpy() * factor_vals
+        chg = np.zeros_like(close)
+        chg[1:] = close[1:] - close[:-1]
+        chg[np.isnan(chg)] = 0
 
-        # Find each day's adjust factor
-        factor_vals = _assign_factor_value_to_day(
-            nb.typed.List(factors_df["timestamp"].tolist()),
-            nb.typed.List(factors_df["hfq_factor"].tolist()),
-            nb.typed.List(bars_df["timestamp"].tolist()),
-        )
+        pct_chg = np.zeros_like(close)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct_chg[1:] = 100 * (chg[1:] / close[:-1])
+        pct_chg[np.isnan(pct_chg)] = 0
 
-        # Adjust prices accordingly
-        bars_df[["open", "close", "high", "low"]] *= np.array(factor_vals).reshape(
-            -1, 1
-        )
-        bars_df["chg"] = (bars_df["close"] - bars_df["close"].shift(1)).fillna(0)
-        bars_df["pct_chg"] = (
-            100 * (bars_df["chg"] / bars_df["close"].shift(1))
-        ).fillna(0)
-        return bars_df.round(2)
+        return bars_df.assign(
+            open=bars_df["open"].to_numpy() * factor_vals,
+            close=close,
+            high=bars_df["high"].to_numpy() * factor_vals,
+            low=bars_df["low"].to_numpy() * factor_vals,
+            chg=chg,
+            pct_chg=pct_chg,
+        ).round(2)
 
     def backward_adjust_stocks_latest_prices(
         self, bars_df: pd.DataFrame
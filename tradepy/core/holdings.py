@@ -12,10 +12,10 @@ class Holdings:
 
     @property
     def position_codes(self) -> set[str]:
-        return set(code for code, _ in self)
+        return set(self.positions)
 
     def update_price(self, price_lookup: PriceLookupFun):
-        for _, pos in self:
+        for pos in self.positions.values():
             with suppress(KeyError):
                 pos.update_price(price_lookup(pos.code))
 
@@ -28,7 +28,7 @@ class Holdings:
                 raise ValueError(f"{pos.code} already in position")
 
             self.positions[pos.code] = pos
-            total += pos.cost
+            total += round(pos.cost, 2)
 
         return total
 
@@ -48,7 +48,10 @@ class Holdings:
         return total
 
     def get_total_market_value(self):
-        return sum(pos.total_value_at(pos.latest_price) for _, pos in self)
+        return sum(
+            round(pos.total_value_at(pos.latest_price), 2)
+            for pos in self.positions.values()
+        )
 
     def has(self, code) -> bool:
         return code in self.positions
@@ -1,4 +1,6 @@
+import os
 import uuid
+import itertools
 from loguru import logger
 from datetime import date, datetime
 from dateutil import parser as date_parser
@@ -26,6 +28,24 @@ ACTION_TO_CODE: dict[TradeActionType, str] = {
 }
 
 
+# Order ids only need to be unique within a trade book, so a per-process counter
+# (plus a random prefix telling the processes apart) does instead of a UUID per order
+_ID_PREFIX = ""
+_ID_SEQ = itertools.count()
+
+
+def _reset_id_source():
+    global _ID_PREFIX, _ID_SEQ
+    _ID_PREFIX = uuid.uuid4().hex[:6]
+    _ID_SEQ = itertools.count()
+
+
+_reset_id_source()
+# Forked children (e.g., celery prefork workers) would otherwise inherit the parent's
+# prefix and counter, and hand out the very same ids as their siblings
+os.register_at_fork(after_in_child=_reset_id_source)
+
+
 class Order(BaseModel):
     id: str | None = None  # Can be null when creating an order
     timestamp: str
@@ -108,7 +128,7 @@ class Order(BaseModel):
 
     @staticmethod
     def make_id(code) -> str:
-        return code + "-" + str(uuid.uuid4()).split("-")[1]
+        return f"{code}-{_ID_PREFIX}{next(_ID_SEQ):x}"
 
     def serialize_tags(self) -> str:
         if not self.tags:
@@ -35,35 +35,28 @@ class Position(BaseModel):
         return order
 
     @property
-    @round_val
     def cost(self):
         return self.total_value_at(self.price)
 
     @property
-    @round_val
     def total_value(self) -> float:
         return self.total_value_at(self.latest_price)
 
     @property
-    @round_val
     def yesterday_total_value(self) -> float:
         return self.total_value_at(self.price)
 
-    @round_val
     def total_value_at(self, price: float) -> float:
         return price * self.vol
 
-    @round_val
     def profit_or_loss_at(self, price: float) -> float:
         return self.total_value_at(price) - self.cost
 
-    @round_val
     def chg_at(self, price: float) -> float:
         return price - self.price
 
-    @round_val
     def pct_chg_at(self, price: float) -> float:
-        if self.chg_at(price) == 0:
+        if round(self.chg_at(price), 2) == 0:
             return 0
         return calc_pct_chg(self.price, price)
 
@@ -64,6 +64,13 @@ def tag(outputs=list(), notna=False):
     return inner
 
 
+def jit_predicate(fun):
+    # Mark a purely numeric should_buy / should_sell (i.e. not touching `self`),
+    # so that the backtester can compile it with Numba and evaluate all stocks of a day at once
+    fun.__jit_predicate__ = True
+    return fun
+
+
 def require_mode(*modes: "ModeType"):
     def inner(fun):
         def decor(*args, **kwargs):
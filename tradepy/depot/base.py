@@ -1,4 +1,5 @@
 import abc
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from contextlib import suppress
@@ -53,6 +54,21 @@ class GenericBarsDepot:
         df.to_csv(out_path, index=False)
         return out_path
 
+    def save_partitioned(self, df: pd.DataFrame, by: str = "code") -> list[Path]:
+        # Write one csv per distinct value of `by` (e.g., <code>.csv), slicing a single
+        # sorted copy rather than grouping and dropping the column per group
+        keys = df[by].to_numpy()
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        body = df.drop(by, axis=1).take(order)
+
+        uniq_keys, starts = np.unique(keys, return_index=True)
+        ends = np.append(starts[1:], len(keys))
+        return [
+            self.save(body.iloc[start:end], filename=f"{key}.csv")
+            for key, start, end in zip(uniq_keys, starts, ends)
+        ]
+
     def append(self, df: pd.DataFrame, filename: str):
         assert filename.endswith("csv")
         path = self.folder / filename
@@ -93,7 +93,7 @@ class AssetsSyncer:
             Account(
                 free_cash_amount=free_cash_amount,
                 frozen_cash_amount=frozen_cash_amount,
-                market_value=sum(p.total_value for p in positions),
+                market_value=round(sum(p.total_value for p in positions), 2),
             )
         )
 
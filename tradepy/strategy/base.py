@@ -1,11 +1,17 @@
+import os
 import abc
 import sys
 import inspect
+import multiprocessing as mp
+import numba as nb
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from functools import cache, cached_property
 from itertools import chain
 from collections import defaultdict
-from typing import TypedDict, Generic, TypeVar
+from typing import Callable, TypedDict, Generic, TypeVar
+from numba.core.errors import NumbaError
 from tqdm import tqdm
 
 import tradepy
@@ -42,6 +48,27 @@ Weight = float
 BuyOption = tuple[Price, Weight]
 
 
+# The strategy and indicators each indicator computing process works with,
+# inherited from the parent process via fork
+_worker_context: tuple["StrategyBase", list[Indicator]] | None = None
+
+
+def _init_compute_worker(strategy: "StrategyBase", indicators: list[Indicator]):
+    global _worker_context
+    _worker_context = strategy, indicators
+
+
+def _compute_in_worker(bars_df: pd.DataFrame) -> pd.DataFrame:
+    assert _worker_context is not None
+    strategy, indicators = _worker_context
+    return strategy._adjust_then_compute(bars_df, indicators)
+
+
+def _can_fork_workers() -> bool:
+    # Daemonic processes (e.g., dask or celery workers) are not allowed to have children
+    return "fork" in mp.get_all_start_methods() and not mp.current_process().daemon
+
+
 class IndicatorsRegistry:
     def __init__(self) -> None:
         self.registry: dict[str, IndicatorSet] = defaultdict(IndicatorSet)
@@ -49,17 +76,27 @@ class IndicatorsRegistry:
     def register(self, strategy_class_name: str, indicator: Indicator):
         self.registry[strategy_class_name].add(indicator)
 
-    @cache
+    # NOTE: the specs and the execute order only depend on the strategy class, so cache
+    # them per class rather than per strategy instance (e.g., one per backtest run)
     def get_specs(self, strategy: "StrategyBase") -> list[Indicator]:
+        return self._get_class_specs(type(strategy))
+
+    def resolve_execute_order(self, strategy: "StrategyBase") -> list[Indicator]:
+        return self._resolve_class_execute_order(type(strategy))
+
+    @cache
+    def _get_class_specs(self, strategy_class: type["StrategyBase"]) -> list[Indicator]:
         ind_iter = chain.from_iterable(
-            self.registry[kls.__name__] for kls in strategy.__class__.__mro__
+            self.registry[kls.__name__] for kls in strategy_class.__mro__
         )
         return list(ind_iter)
 
     @cache
-    def resolve_execute_order(self, strategy: "StrategyBase") -> list[Indicator]:
-        indicator_set = IndicatorSet(*strategy.all_indicators)
-        return indicator_set.sort_by_execute_order(strategy._required_indicators)
+    def _resolve_class_execute_order(
+        self, strategy_class: type["StrategyBase"]
+    ) -> list[Indicator]:
+        indicator_set = IndicatorSet(*self._get_class_specs(strategy_class))
+        return indicator_set.sort_by_execute_order(strategy_class._required_indicators)
 
     def __str__(self) -> str:
         return str(self.registry)
@@ -68,33 +105,48 @@ class IndicatorsRegistry:
         return str(self)
 
 
+@cache
+def _vectorize_predicate(fun: Callable, n_args: int, returns_option: bool):
+    # Wrap the jitted method into a fixed-arity kernel (`self` is passed as None),
+    # since numba.vectorize does not accept varargs
+    args = ", ".join(f"x{i}" for i in range(n_args))
+    expr = f"jitted(None, {args})" + (" is not None" if returns_option else "")
+    namespace = {"jitted": nb.njit(fun)}
+    exec(f"def kernel({args}):\n    return {expr}", namespace)
+    return nb.vectorize(nopython=True)(namespace["kernel"])
+
+
 class StrategyBase(Generic[BarDataType]):
     indicators_registry: IndicatorsRegistry = IndicatorsRegistry()
 
-    def __init__(self, conf: StrategyConf) -> None:
-        self.conf = conf
-
-        self._adjust_factors: AdjustFactors | None = None
-        self.buy_indicators: list[str] = inspect.getfullargspec(self.should_buy).args[
-            1:
-        ]
-        self.sell_indicators: list[str] = inspect.getfullargspec(self.should_sell).args[
-            1:
-        ]
-        self.stop_loss_indicators: list[str] = inspect.getfullargspec(
-            self.should_stop_loss
-        ).args[3:]
-        self.take_profit_indicators: list[str] = inspect.getfullargspec(
-            self.should_take_profit
+    buy_indicators: list[str]
+    sell_indicators: list[str]
+    stop_loss_indicators: list[str]
+    take_profit_indicators: list[str]
+    _required_indicators: list[str]
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+
+        # Inspect the signatures once per class rather than per instance
+        cls.buy_indicators = inspect.getfullargspec(cls.should_buy).args[1:]
+        cls.sell_indicators = inspect.getfullargspec(cls.should_sell).args[1:]
+        cls.stop_loss_indicators = inspect.getfullargspec(cls.should_stop_loss).args[3:]
+        cls.take_profit_indicators = inspect.getfullargspec(
+            cls.should_take_profit
         ).args[3:]
 
-        self._required_indicators: list[str] = list(
-            self.buy_indicators
-            + self.sell_indicators
-            + self.stop_loss_indicators
-            + self.take_profit_indicators
+        cls._required_indicators = list(
+            cls.buy_indicators
+            + cls.sell_indicators
+            + cls.stop_loss_indicators
+            + cls.take_profit_indicators
         )
 
+    def __init__(self, conf: StrategyConf) -> None:
+        self.conf = conf
+        self._adjust_factors: AdjustFactors | None = None
+
     def __getattr__(self, name: str):
         # Lookup custom strategy parameters from the conf object
         return getattr(self.conf, name)
@@ -110,14 +162,8 @@ class StrategyBase(Generic[BarDataType]):
         return bars_df
 
     def post_process(self, bars_df: pd.DataFrame):
-        notna_indicators: list[str] = [
-            ind.name
-            for ind in self.all_indicators
-            if ind.name in self._required_indicators and ind.notna
-        ]
-
-        if notna_indicators:
-            bars_df.dropna(subset=notna_indicators, inplace=True)
+        if self._notna_indicators:
+            bars_df = bars_df.dropna(subset=self._notna_indicators)
 
         return bars_df
 
@@ -131,6 +177,14 @@ class StrategyBase(Generic[BarDataType]):
     def all_indicators(self) -> list[Indicator]:
         return self.indicators_registry.get_specs(self)
 
+    @cached_property
+    def _notna_indicators(self) -> list[str]:
+        return [
+            ind.name
+            for ind in self.all_indicators
+            if ind.name in self._required_indicators and ind.notna
+        ]
+
     @abc.abstractmethod
     def should_stop_loss(
         self, tick: BarDataType, position: Position, *indicators
@@ -150,6 +204,67 @@ class StrategyBase(Generic[BarDataType]):
     def should_sell(self, *indicators) -> bool:
         return False
 
+    def should_buy_vec(self, *indicators: np.ndarray) -> np.ndarray | None:
+        """
+        (可选) should_buy 的向量化版本, 用于在逐一调用 should_buy 之前批量过滤个股
+
+        :param indicators: 与 should_buy 的参数相同, 但每个参数为当日所有个股该指标的数组
+        :return: 布尔数组, 只有为 True 的个股才会再调用 should_buy 以给出买入价格和权重;
+                 返回 None 则对所有个股调用 should_buy. 若 should_buy 被 jit_predicate 标记,
+                 默认由 Numba 编译 should_buy 生成
+        """
+        return self._apply_jit_predicate(
+            type(self).should_buy, indicators, returns_option=True
+        )
+
+    def should_sell_vec(self, *indicators: np.ndarray) -> np.ndarray | None:
+        """
+        (可选) should_sell 的向量化版本
+
+        :param indicators: 与 should_sell 的参数相同, 但每个参数为当日所有个股该指标的数组
+        :return: 布尔数组, 为 True 的个股将被平仓; 返回 None 则对每支个股调用 should_sell.
+                 若 should_sell 被 jit_predicate 标记, 默认由 Numba 编译 should_sell 生成
+        """
+        return self._apply_jit_predicate(type(self).should_sell, indicators)
+
+    def _apply_jit_predicate(
+        self, fun: Callable, indicators: tuple[np.ndarray, ...], returns_option=False
+    ) -> np.ndarray | None:
+        if not indicators or not getattr(fun, "__jit_predicate__", False):
+            return None
+
+        try:
+            ufunc = _vectorize_predicate(fun, len(indicators), returns_option)
+            return np.asarray(ufunc(*indicators), dtype=bool)
+        except (NumbaError, TypeError) as exc:
+            LOG.warn(f"{fun.__qualname__} 无法被 Numba 编译, 将逐一调用: {exc}")
+            fun.__jit_predicate__ = False
+            return None
+
+    def should_stop_loss_vec(
+        self, bars: dict[str, np.ndarray], prices: np.ndarray
+    ) -> np.ndarray | None:
+        """
+        (可选) 批量筛选可能触发止损的持仓, 只有被选中的持仓才会再调用 should_stop_loss
+
+        :param bars: 当日K线各字段 (open, close, high, low) 的数组, 每个元素对应一个持仓
+        :param prices: 各持仓的成本价
+        :return: 布尔数组; 返回 None 则对所有持仓调用 should_stop_loss
+        """
+        return None
+
+    def should_take_profit_vec(
+        self, bars: dict[str, np.ndarray], prices: np.ndarray
+    ) -> np.ndarray | None:
+        """
+        (可选) 批量筛选可能触发止盈的持仓, 只有被选中的持仓才会再调用 should_take_profit
+
+        :param bars: 当日K线各字段 (open, close, high, low) 的数组, 每个元素对应一个持仓
+        :param prices: 各持仓的成本价
+        :return: 布尔数组; 返回 None 则对所有持仓调用 should_take_profit
+        """
+        return None
+
     def adjust_portfolio_and_budget(
         self,  # THE ABSOLUTELY WORST INTERFACE IN THIS PROJECT!
         port_df: pd.DataFrame,
@@ -222,7 +337,11 @@ class StrategyBase(Generic[BarDataType]):
 
     def _adjust_then_compute(self, bars_df: pd.DataFrame, indicators: list[Indicator]):
         code: str = bars_df.index[0]  # type: ignore
-        bars_df.sort_values("timestamp", inplace=True)
+        if bars_df["timestamp"].is_monotonic_increasing:
+            # Already sorted by compute_all_indicators_df, only detach it from the whole frame
+            bars_df = bars_df.copy()
+        else:
+            bars_df = bars_df.sort_values("timestamp")
 
         # Pre-processing
         bars_df = self.pre_process(bars_df)
@@ -232,7 +351,8 @@ class StrategyBase(Generic[BarDataType]):
 
         price_adjusted = "orig_open" in bars_df
         if not price_adjusted:
-            self._adjust_factors = AdjustFactorDepot.load()
+            if self._adjust_factors is None:
+                self._adjust_factors = AdjustFactorDepot.load()
             # Adjust prices before computing indicators
             try:
                 bars_df["orig_open"] = bars_df["open"].copy()
@@ -262,7 +382,16 @@ class StrategyBase(Generic[BarDataType]):
         # Post-process and done
         return self.post_process(bars_df)
 
-    def compute_all_indicators_df(self, df: pd.DataFrame) -> pd.DataFrame:
+    def compute_all_indicators_df(
+        self, df: pd.DataFrame, n_workers: int | None = None
+    ) -> pd.DataFrame:
+        """
+        计算所有个股的后复权价格以及策略所需的技术因子
+
+        :param df: 所有个股的日K数据
+        :param n_workers: 并行计算的进程数, 默认为CPU核数, 1 表示在当前进程内逐一计算
+        :return: 包含技术因子的日K数据
+        """
         LOG.info(">>> 获取待计算因子")
         indicators = [
             ind
@@ -277,19 +406,49 @@ class StrategyBase(Generic[BarDataType]):
 
         if df.index.name != "code":
             LOG.info(">>> 重建索引")
-            df.reset_index(inplace=True)
-            df.set_index("code", inplace=True, drop=False)
+            df = df.reset_index().set_index("code", drop=False)
+
+        # Sort by (code, timestamp) once, rather than sorting each stock's bars separately
+        order = np.lexsort((df["timestamp"].to_numpy(), df.index.to_numpy()))
+        if not (order[1:] > order[:-1]).all():
+            df = df.iloc[order]
+
+        if "orig_open" not in df and self._adjust_factors is None:
+            # Load before forking so that the workers inherit the factors
+            self._adjust_factors = AdjustFactorDepot.load()
 
         LOG.info(">>> 计算每支个股的后复权价格以及技术因子")
         n_codes = df.index.nunique()
         miniters = n_codes // 20  # print progress every 5%
-        return pd.concat(
-            self._adjust_then_compute(bars_df.copy(), indicators)
-            for _, bars_df in tqdm(
-                df.groupby(level="code"), file=sys.stdout, miniters=miniters
-            )
+        progress = lambda it: tqdm(
+            it, total=n_codes, file=sys.stdout, miniters=miniters
         )
 
+        n_workers = n_workers or os.cpu_count() or 1
+        if n_workers > 1 and _can_fork_workers():
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=mp.get_context("fork"),
+                initializer=_init_compute_worker,
+                initargs=(self, indicators),
+            ) as executor:
+                results = executor.map(
+                    _compute_in_worker,
+                    (bars_df for _, bars_df in df.groupby(level="code")),
+                    chunksize=32,
+                )
+                parts = [bars_df for bars_df in progress(results) if not bars_df.empty]
+        else:
+            parts = []
+            for _, bars_df in progress(df.groupby(level="code")):
+                bars_df = self._adjust_then_compute(bars_df, indicators)
+                if not bars_df.empty:
+                    parts.append(bars_df)
+
+        if not parts:
+            return df.iloc[:0]
+        return pd.concat(parts, copy=False)
+
 
 class BacktestStrategy(StrategyBase[BarData]):
     def should_stop_loss(self, bar: BarData, position: Position) -> float | None:
@@ -314,6 +473,28 @@ class BacktestStrategy(StrategyBase[BarData]):
         if high_pct_chg >= self.take_profit:
             return position.price_at_pct_change(self.take_profit)
 
+    # NOTE: the candidates are picked with a little tolerance, since calc_pct_chg
+    # rounds the percentage change. should_stop_loss / should_take_profit have the
+    # final say.
+    def should_stop_loss_vec(
+        self, bars: dict[str, np.ndarray], prices: np.ndarray
+    ) -> np.ndarray | None:
+        if type(self).should_stop_loss is not BacktestStrategy.should_stop_loss:
+            return None
+
+        # fmin / fmax skip NaN, so that a missing open doesn't screen out the row
+        lowest = np.fmin(bars["open"], bars["low"])
+        return 100 * (lowest - prices) / prices <= -self.stop_loss + 0.01
+
+    def should_take_profit_vec(
+        self, bars: dict[str, np.ndarray], prices: np.ndarray
+    ) -> np.ndarray | None:
+        if type(self).should_take_profit is not BacktestStrategy.should_take_profit:
+            return None
+
+        highest = np.fmax(bars["open"], bars["high"])
+        return 100 * (highest - prices) / prices >= self.take_profit - 0.01
+
     @classmethod
     def backtest(
         cls, bars_df: pd.DataFrame, conf: BacktestConf
@@ -1,5 +1,11 @@
 import abc
-from tradepy.trade_book.types import TradeLog, CapitalsLog
+import pandas as pd
+from tradepy.trade_book.types import (
+    TradeLog,
+    TradeLogRow,
+    CapitalsLog,
+    TRADE_LOG_COLUMNS,
+)
 
 
 class TradeBookStorage:
@@ -12,6 +18,14 @@ class TradeBookStorage:
     def buy(self, log: TradeLog):
         raise NotImplementedError
 
+    # Positional entry points, taking the fields in TRADE_LOG_COLUMNS order. Storages
+    # keyed by field name (e.g., SQLite) just take the dict form
+    def buy_row(self, row: TradeLogRow):
+        self.buy(dict(zip(TRADE_LOG_COLUMNS, row)))  # type: ignore
+
+    def sell_row(self, row: TradeLogRow):
+        self.sell(dict(zip(TRADE_LOG_COLUMNS, row)))  # type: ignore
+
     @abc.abstractmethod
     def log_opening_capitals(self, log: CapitalsLog):
         raise NotImplementedError
@@ -28,6 +42,12 @@ class TradeBookStorage:
     def fetch_capital_logs(self) -> list[CapitalsLog]:
         raise NotImplementedError
 
+    def fetch_trade_logs_df(self) -> pd.DataFrame:
+        return pd.DataFrame(self.fetch_trade_logs())
+
+    def fetch_capital_logs_df(self) -> pd.DataFrame:
+        return pd.DataFrame(self.fetch_capital_logs())
+
     @abc.abstractmethod
     def get_opening(self, date: str) -> CapitalsLog | None:
         raise NotImplementedError
@@ -1,30 +1,51 @@
-from copy import deepcopy
-from tradepy.trade_book.types import TradeLog, CapitalsLog
+import pandas as pd
+from tradepy.trade_book.types import (
+    TradeLog,
+    TradeLogRow,
+    CapitalsLog,
+    TRADE_LOG_COLUMNS,
+    CAPITALS_LOG_COLUMNS,
+)
 from tradepy.trade_book.storage import TradeBookStorage
 
 
 class InMemoryTradeBookStorage(TradeBookStorage):
     def __init__(self) -> None:
-        self.trade_logs: list[TradeLog] = list()
-        self.capital_logs: list[CapitalsLog] = list()
+        # Logs are kept as tuples in the *_LOG_COLUMNS orders, which are much lighter
+        # than one dict per log and turn into a data frame without per-row key lookups
+        self.trade_logs: list[tuple] = list()
+        self.capital_logs: list[tuple] = list()
 
     def sell(self, log: TradeLog):
-        self.trade_logs.append(log)
+        self.trade_logs.append(tuple(map(log.get, TRADE_LOG_COLUMNS)))
 
     def buy(self, log: TradeLog):
-        self.trade_logs.append(log)
+        self.trade_logs.append(tuple(map(log.get, TRADE_LOG_COLUMNS)))
+
+    def sell_row(self, row: TradeLogRow):
+        self.trade_logs.append(row)
+
+    def buy_row(self, row: TradeLogRow):
+        self.trade_logs.append(row)
 
     def log_closing_capitals(self, log: CapitalsLog):
-        self.capital_logs.append(log)
+        self.capital_logs.append(tuple(map(log.get, CAPITALS_LOG_COLUMNS)))
 
     def fetch_trade_logs(self) -> list[TradeLog]:
-        return self.trade_logs
+        return [dict(zip(TRADE_LOG_COLUMNS, row)) for row in self.trade_logs]  # type: ignore
 
     def fetch_capital_logs(self) -> list[CapitalsLog]:
-        return self.capital_logs
+        return [dict(zip(CAPITALS_LOG_COLUMNS, row)) for row in self.capital_logs]  # type: ignore
+
+    def fetch_trade_logs_df(self) -> pd.DataFrame:
+        return pd.DataFrame(self.trade_logs, columns=TRADE_LOG_COLUMNS)
+
+    def fetch_capital_logs_df(self) -> pd.DataFrame:
+        return pd.DataFrame(self.capital_logs, columns=CAPITALS_LOG_COLUMNS)
 
     def clone(self) -> "InMemoryTradeBookStorage":
+        # The rows are immutable tuples of scalars, so shallow copies suffice
         instance = InMemoryTradeBookStorage()
-        instance.trade_logs = deepcopy(self.trade_logs)
-        instance.capital_logs = deepcopy(self.capital_logs)
+        instance.trade_logs = list(self.trade_logs)
+        instance.capital_logs = list(self.capital_logs)
         return instance
@@ -6,7 +6,13 @@ from functools import cached_property
 from tradepy.core.account import Account
 from tradepy.core.models import Position
 from tradepy.types import TradeActions, TradeActionType
-from tradepy.trade_book.types import CapitalsLog, TradeLog, AnyAccount
+from tradepy.trade_book.types import (
+    CapitalsLog,
+    TradeLog,
+    TradeLogRow,
+    AnyAccount,
+    TRADE_LOG_COLUMNS,
+)
 from tradepy.trade_book.storage import (
     TradeBookStorage,
     SQLiteTradeBookStorage,
@@ -20,14 +26,14 @@ class TradeBook:
 
     @cached_property
     def trade_logs_df(self) -> pd.DataFrame:
-        df = pd.DataFrame(self.storage.fetch_trade_logs())
+        df = self.storage.fetch_trade_logs_df()
         df.set_index("timestamp", inplace=True)
         df.sort_index(inplace=True)
         return df
 
     @cached_property
     def cap_logs_df(self) -> pd.DataFrame:
-        cap_df = pd.DataFrame(self.storage.fetch_capital_logs())
+        cap_df = self.storage.fetch_capital_logs_df()
         cap_df["timestamp"] = pd.to_datetime(cap_df["timestamp"])
         cap_df["capital"] = (
             cap_df["market_value"]
@@ -45,41 +51,53 @@ class TradeBook:
         return TradeBook(storage)
 
     def make_open_position_log(self, timestamp: str, pos: Position) -> TradeLog:
-        chg = pos.chg_at(pos.latest_price)
-        pct_chg = pos.pct_chg_at(pos.latest_price)
-
-        return {
-            "timestamp": timestamp,
-            "action": TradeActions.OPEN,
-            "id": pos.id,
-            "code": pos.code,
-            "vol": pos.vol,
-            "price": pos.price,
-            "total_value": pos.price * pos.vol,
-            "chg": chg,
-            "pct_chg": pct_chg,
-            "total_return": (pos.price * pct_chg * 1e-2) * pos.vol,
-        }
+        row = self.make_open_position_row(timestamp, pos)
+        return dict(zip(TRADE_LOG_COLUMNS, row))  # type: ignore
 
     def make_close_position_log(
         self, timestamp: str, pos: Position, action: TradeActionType
     ) -> TradeLog:
-        chg = pos.chg_at(pos.latest_price)
+        row = self.make_close_position_row(timestamp, pos, action)
+        return dict(zip(TRADE_LOG_COLUMNS, row))  # type: ignore
+
+    # The logs in the positional form (see TRADE_LOG_COLUMNS), which the in-memory
+    # storage keeps as is
+    def make_open_position_row(self, timestamp: str, pos: Position) -> TradeLogRow:
+        chg = round(pos.chg_at(pos.latest_price), 2)
+        pct_chg = pos.pct_chg_at(pos.latest_price)
+
+        return (
+            timestamp,
+            TradeActions.OPEN,
+            pos.id,
+            pos.code,
+            pos.vol,
+            pos.price,
+            pos.price * pos.vol,  # total_value
+            chg,
+            pct_chg,
+            (pos.price * pct_chg * 1e-2) * pos.vol,  # total_return
+        )
+
+    def make_close_position_row(
+        self, timestamp: str, pos: Position, action: TradeActionType
+    ) -> TradeLogRow:
+        chg = round(pos.chg_at(pos.latest_price), 2)
         pct_chg = pos.pct_chg_at(pos.latest_price)
         sold_vol = pos.yesterday_vol
 
-        return {
-            "timestamp": timestamp,
-            "action": action,
-            "id": pos.id,
-            "code": pos.code,
-            "vol": sold_vol,
-            "price": pos.latest_price,
-            "total_value": pos.latest_price * sold_vol,
-            "chg": chg,
-            "pct_chg": pct_chg,
-            "total_return": (pos.price * pct_chg * 1e-2) * sold_vol,
-        }
+        return (
+            timestamp,
+            action,
+            pos.id,
+            pos.code,
+            sold_vol,
+            pos.latest_price,
+            pos.latest_price * sold_vol,  # total_value
+            chg,
+            pct_chg,
+            (pos.price * pct_chg * 1e-2) * sold_vol,  # total_return
+        )
 
     def make_capital_log(self, timestamp, account: AnyAccount) -> CapitalsLog:
         return {
@@ -90,19 +108,19 @@ class TradeBook:
         }
 
     def buy(self, timestamp: str, pos: Position):
-        log = self.make_open_position_log(timestamp, pos)
+        row = self.make_open_position_row(timestamp, pos)
         try:
-            self.storage.buy(log)
+            self.storage.buy_row(row)
         except Exception as exc:
-            logger.error(f"导出开仓日志错误, {log}")
+            logger.error(f"导出开仓日志错误, {dict(zip(TRADE_LOG_COLUMNS, row))}")
             raise exc
 
     def sell(self, timestamp: str, pos: Position, action: TradeActionType):
-        log = self.make_close_position_log(timestamp, pos, action)
+        row = self.make_close_position_row(timestamp, pos, action)
         try:
-            self.storage.sell(log)
+            self.storage.sell_row(row)
         except Exception as exc:
-            logger.error(f"导出开仓日志错误, {log}")
+            logger.error(f"导出开仓日志错误, {dict(zip(TRADE_LOG_COLUMNS, row))}")
             raise exc
 
     def close(self, *args, **kwargs):
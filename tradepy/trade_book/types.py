@@ -25,4 +25,11 @@ class CapitalsLog(TypedDict):
     frozen_cash_amount: float
 
 
+# Field orders of the positional (tuple) forms of the logs
+TRADE_LOG_COLUMNS = tuple(TradeLog.__annotations__)
+CAPITALS_LOG_COLUMNS = tuple(CapitalsLog.__annotations__)
+
+TradeLogRow = tuple
+
+
 AnyAccount = Union[Account, BacktestAccount]  # FIXME: not so cool ...